@@ -28,12 +28,44 @@ class Cube:
         'F': [1,1,1,1], 'B': [1,1,1,1],
         'L': [1,1,1,1], 'R': [1,1,1,1]
     }
+    # 白色十字棱块编号: DF, DR, DB, DL
+    cross_edges = [5,4,7,6]
     def __init__(self):
         self.cp = list(range(8))
         self.co = [0]*8
         self.ep = list(range(12))
         self.eo = [0]*12
         self.size = 3  # 兼容plotly_cube
+        # 增量维护的派生数据，直接改写cp/co/ep/eo后需调用sync()
+        self.solved_pieces = 20    # 位置与朝向都正确的角块+棱块数
+        self.cross_edges_home = 4  # 已归位的十字棱块数
+        self._undo_stack = []      # 已apply的转动，撤销时执行其逆转动
+
+    def sync(self):
+        """重新计算派生数据并清空撤销栈。"""
+        self.solved_pieces = self.cross_edges_home = 0
+        for face in ('U', 'D'):
+            # U、D两层恰好覆盖全部8个角块和前8个棱块位置
+            self._tally(face, 1)
+        for i in range(8, 12):
+            if self.ep[i] == i and self.eo[i] == 0:
+                self.solved_pieces += 1
+        self._undo_stack = []
+
+    def _tally(self, face, sign):
+        # 把face层8个位置上的已复原块数、已归位十字棱块数按sign计入派生数据
+        cp, co, ep, eo = self.cp, self.co, self.ep, self.eo
+        solved = cross = 0
+        for i in self.corner_cycles[face]:
+            if cp[i] == i and co[i] == 0:
+                solved += 1
+        for i in self.edge_cycles[face]:
+            if ep[i] == i and eo[i] == 0:
+                solved += 1
+                if i in self.cross_edges:
+                    cross += 1
+        self.solved_pieces += sign * solved
+        self.cross_edges_home += sign * cross
 
     def to_kociemba_string(self):
         color_map = {'U':'Y','R':'R','F':'G','D':'W','L':'O','B':'B'}
@@ -95,27 +127,54 @@ class Cube:
 
     def move(self, move):
         face = move[0]
-        clockwise = not (len(move)>1 and move[1] == "'")
-        idxs = self.corner_cycles[face]
-        oris = self.corner_orient_delta[face]
-        if not clockwise:
-            idxs = idxs[::-1]
-            oris = oris[::-1]
-        tmp_cp = [self.cp[i] for i in idxs]
-        tmp_co = [self.co[i] for i in idxs]
-        for i in range(4):
-            self.cp[idxs[i]] = tmp_cp[(i-1)%4]
-            self.co[idxs[i]] = (tmp_co[(i-1)%4] + oris[i]) % 3
-        idxs = self.edge_cycles[face]
-        oris = self.edge_orient_delta[face]
-        if not clockwise:
-            idxs = idxs[::-1]
-            oris = oris[::-1]
-        tmp_ep = [self.ep[i] for i in idxs]
-        tmp_eo = [self.eo[i] for i in idxs]
-        for i in range(4):
-            self.ep[idxs[i]] = tmp_ep[(i-1)%4]
-            self.eo[idxs[i]] = (tmp_eo[(i-1)%4] + oris[i]) % 2
+        self._tally(face, -1)
+        if len(move)>1 and move[1] == '2':
+            # 180度转动 = 同向转两次
+            self._turn(face, True)
+            self._turn(face, True)
+        else:
+            self._turn(face, not (len(move)>1 and move[1] == "'"))
+        self._tally(face, 1)
+
+    def apply(self, move):
+        """原地执行转动并压入撤销栈（只记录转动本身）。"""
+        self.move(move)
+        self._undo_stack.append(move)
+
+    def undo(self):
+        """撤销最近一次apply（执行其逆转动），返回被撤销的转动。"""
+        if not self._undo_stack:
+            raise IndexError('撤销栈为空')
+        move = self._undo_stack.pop()
+        face = move[0]
+        self._tally(face, -1)
+        if len(move)>1 and move[1] == '2':
+            self._turn(face, True)
+            self._turn(face, True)
+        else:
+            self._turn(face, len(move)>1 and move[1] == "'")
+        self._tally(face, 1)
+        return move
+
+    def _turn(self, face, clockwise):
+        # 原地四循环，不分配临时列表
+        cp, co, ep, eo = self.cp, self.co, self.ep, self.eo
+        a, b, c, d = self.corner_cycles[face]
+        oa, ob, oc, od = self.corner_orient_delta[face]
+        if clockwise:
+            cp[a], cp[b], cp[c], cp[d] = cp[d], cp[a], cp[b], cp[c]
+            co[a], co[b], co[c], co[d] = (co[d]+oa)%3, (co[a]+ob)%3, (co[b]+oc)%3, (co[c]+od)%3
+        else:
+            cp[a], cp[b], cp[c], cp[d] = cp[b], cp[c], cp[d], cp[a]
+            co[a], co[b], co[c], co[d] = (co[b]+oa)%3, (co[c]+ob)%3, (co[d]+oc)%3, (co[a]+od)%3
+        a, b, c, d = self.edge_cycles[face]
+        oa, ob, oc, od = self.edge_orient_delta[face]
+        if clockwise:
+            ep[a], ep[b], ep[c], ep[d] = ep[d], ep[a], ep[b], ep[c]
+            eo[a], eo[b], eo[c], eo[d] = (eo[d]+oa)%2, (eo[a]+ob)%2, (eo[b]+oc)%2, (eo[c]+od)%2
+        else:
+            ep[a], ep[b], ep[c], ep[d] = ep[b], ep[c], ep[d], ep[a]
+            eo[a], eo[b], eo[c], eo[d] = (eo[b]+oa)%2, (eo[c]+ob)%2, (eo[d]+oc)%2, (eo[a]+od)%2
 
     def get_state(self):
         # 兼容plotly_cube的可视化接口，输出与PieceCube一致的结构
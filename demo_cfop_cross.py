@@ -1,6 +1,7 @@
 from cube.kociemba_cube import Cube
-from view.plotly_cube import plot_cube
+from view.plotly_cube import plot_cube_steps
 from tutorial.cfop_cross import cfop_cross_solver, is_cross_solved
+import copy
 import random
 
 # 随机打乱公式生成器
@@ -28,19 +29,27 @@ def cross_solver_stub(cube):
 
 def main():
     cube = Cube()
-    plot_cube(cube, title="Solved Cube", filename="cube_solved.html")
+    snapshots = [copy.deepcopy(cube)]
+    titles = ["Solved"]
 
     scramble = random_scramble(20)
     apply_moves(cube, scramble)
     print("Scramble:", ' '.join(scramble))
-    plot_cube(cube, title="Scrambled Cube", filename="cube_scrambled.html")
+    snapshots.append(copy.deepcopy(cube))
+    titles.append("Scrambled")
 
     cross_steps = cfop_cross_solver(cube, max_depth=7)
     print("Cross solution:", ' '.join(cross_steps))
     for mv in cross_steps:
         cube.move(mv)
-    plot_cube(cube, title="After Cross", filename="cube_cross_cfop.html")
+        snapshots.append(copy.deepcopy(cube))
+        titles.append(f"Cross: {mv}")
     print("Is cross solved?", is_cross_solved(cube))
 
+    # 整个演示只写一个HTML
+    timings = {}
+    plot_cube_steps(snapshots, titles, title="CFOP Cross", filename="cube_cross_cfop.html", timings=timings)
+    print("Render timings:", {k: f"{v*1000:.1f}ms" for k, v in timings.items()})
+
 if __name__ == '__main__':
     main()
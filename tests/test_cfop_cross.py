@@ -0,0 +1,142 @@
+import unittest
+
+from cube.kociemba_cube import Cube
+from tutorial.cfop_cross import (CROSS_MOVE_SET, cfop_cross_solver, cross_distance, is_cross_solved,
+                                 iter_cross_solutions)
+
+SCRAMBLES = [
+    "R U F' L2 D B",
+    "B R2 U' F",
+    "U2 R' B D2 F L'",
+]
+
+
+def scrambled(moves):
+    cube = Cube()
+    for mv in moves.split():
+        cube.move(mv)
+    return cube
+
+
+# 同轴的面互相可交换；规范形里同轴连续转动按此顺序排列
+AXIS_ORDER = ['U', 'D', 'F', 'B', 'L', 'R']
+AXIS = {'U': 'UD', 'D': 'UD', 'F': 'FB', 'B': 'FB', 'L': 'LR', 'R': 'LR'}
+QUARTERS = {'': 1, '2': 2, "'": 3}
+SUFFIX = {1: '', 2: '2', 3: "'"}
+
+
+def canonical(seq):
+    """合并同轴连续转动：同面转数相加（模4），同轴的面按AXIS_ORDER排列。"""
+    moves = [(mv[0], QUARTERS[mv[1:]]) for mv in seq]
+    while True:
+        out = []
+        i = 0
+        while i < len(moves):
+            j = i
+            while j < len(moves) and AXIS[moves[j][0]] == AXIS[moves[i][0]]:
+                j += 1
+            total = {}
+            for face, q in moves[i:j]:
+                total[face] = (total.get(face, 0) + q) % 4
+            out += [(f, total[f]) for f in AXIS_ORDER if total.get(f)]
+            i = j
+        if out == moves:
+            return tuple(f + SUFFIX[q] for f, q in moves)
+        moves = out
+
+
+def brute_force(cube, length):
+    """不剪枝地穷举全部长度为length的转动序列，返回解的规范形集合。
+
+    只保留规范形仍为length步、且按规范形执行时最后一步之前未完成十字的解。
+    """
+    endings = set()
+    path = []
+
+    def dfs():
+        if len(path) == length:
+            if is_cross_solved(cube):
+                endings.add(canonical(path))
+            return
+        for mv in CROSS_MOVE_SET:
+            cube.apply(mv)
+            path.append(mv)
+            dfs()
+            path.pop()
+            cube.undo()
+
+    dfs()
+    found = set()
+    for seq in endings:
+        if len(seq) != length:
+            continue
+        replay = Cube()
+        replay.cp, replay.co, replay.ep, replay.eo = cube.cp[:], cube.co[:], cube.ep[:], cube.eo[:]
+        early = is_cross_solved(replay)
+        for mv in seq[:-1]:
+            replay.move(mv)
+            early = early or is_cross_solved(replay)
+        if not early:
+            found.add(seq)
+    return found
+
+
+class TestIterCrossSolutions(unittest.TestCase):
+    def test_solutions_replay(self):
+        for moves in SCRAMBLES:
+            cube = scrambled(moves)
+            for solution, _ in iter_cross_solutions(cube):
+                replay = scrambled(moves)
+                for mv in solution:
+                    replay.move(mv)
+                self.assertTrue(is_cross_solved(replay), (moves, solution))
+
+    def test_optimal_length_matches_bfs(self):
+        for moves in SCRAMBLES:
+            cube = scrambled(moves)
+            first, _ = next(iter_cross_solutions(cube))
+            self.assertEqual(len(first), cross_distance(cube))
+            self.assertEqual(len(first), len(cfop_cross_solver(cube)))
+
+    def test_complete_at_optimal_and_optimal_plus_one(self):
+        for moves in SCRAMBLES:
+            cube = scrambled(moves)
+            optimal = cross_distance(cube)
+            solutions = [tuple(s) for s, _ in iter_cross_solutions(cube, extra_depth=1)]
+            self.assertEqual(len(solutions), len(set(solutions)))
+            for length in (optimal, optimal + 1):
+                got = {s for s in solutions if len(s) == length}
+                self.assertEqual(got, brute_force(cube, length), (moves, length))
+
+    def test_ordered_by_length_then_cost(self):
+        cube = scrambled(SCRAMBLES[0])
+        weights = {mv: 5 for mv in CROSS_MOVE_SET if mv[0] == 'B'}
+        results = list(iter_cross_solutions(cube, move_costs=weights))
+        keys = [(len(s), cost) for s, cost in results]
+        self.assertEqual(keys, sorted(keys))
+        for solution, cost in results:
+            self.assertEqual(cost, sum(weights.get(mv, 1) for mv in solution))
+        # max_count取到的是排序最靠前的N个
+        head = list(iter_cross_solutions(cube, move_costs=weights, max_count=5))
+        self.assertEqual([(len(s), c) for s, c in head], keys[:5])
+
+    def test_does_not_modify_cube(self):
+        cube = scrambled(SCRAMBLES[1])
+        before = (cube.cp[:], cube.co[:], cube.ep[:], cube.eo[:])
+        list(iter_cross_solutions(cube))
+        self.assertEqual(before, (cube.cp, cube.co, cube.ep, cube.eo))
+
+    def test_solved_cube(self):
+        self.assertEqual(list(iter_cross_solutions(Cube())), [([], 0)])
+
+    def test_max_count_zero(self):
+        self.assertEqual(list(iter_cross_solutions(scrambled(SCRAMBLES[0]), max_count=0)), [])
+        self.assertEqual(list(iter_cross_solutions(Cube(), max_count=0)), [])
+
+    def test_negative_cost_rejected(self):
+        with self.assertRaises(ValueError):
+            iter_cross_solutions(scrambled(SCRAMBLES[0]), move_costs={'R': -1})
+
+
+if __name__ == '__main__':
+    unittest.main()
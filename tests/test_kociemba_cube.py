@@ -0,0 +1,85 @@
+import random
+import unittest
+
+from cube.kociemba_cube import Cube
+
+MOVES = [f + s for f in 'UDFBLR' for s in ('', "'", '2')]
+
+
+def snapshot(cube):
+    return (cube.cp[:], cube.co[:], cube.ep[:], cube.eo[:], cube.solved_pieces, cube.cross_edges_home)
+
+
+def recount(cube):
+    """不依赖增量维护，从头统计派生数据。"""
+    solved = sum(1 for i in range(8) if cube.cp[i] == i and cube.co[i] == 0)
+    solved += sum(1 for i in range(12) if cube.ep[i] == i and cube.eo[i] == 0)
+    cross = sum(1 for i in Cube.cross_edges if cube.ep[i] == i and cube.eo[i] == 0)
+    return solved, cross
+
+
+class TestCubeMove(unittest.TestCase):
+    def test_half_turn_is_two_quarter_turns(self):
+        for face in 'UDFBLR':
+            a, b = Cube(), Cube()
+            a.move(face + '2')
+            b.move(face)
+            b.move(face)
+            self.assertEqual(snapshot(a), snapshot(b))
+
+    def test_inverse_turn(self):
+        for face in 'UDFBLR':
+            cube = Cube()
+            cube.move(face)
+            cube.move(face + "'")
+            self.assertEqual(snapshot(cube), snapshot(Cube()))
+
+
+class TestApplyUndo(unittest.TestCase):
+    def test_random_sequences(self):
+        rng = random.Random(0)
+        for _ in range(100):
+            cube = Cube()
+            seq = rng.choices(MOVES, k=30)
+            history = []
+            for mv in seq:
+                history.append(snapshot(cube))
+                cube.apply(mv)
+                self.assertEqual((cube.solved_pieces, cube.cross_edges_home), recount(cube))
+            for mv in reversed(seq):
+                self.assertEqual(cube.undo(), mv)
+                self.assertEqual(snapshot(cube), history.pop())
+                self.assertEqual((cube.solved_pieces, cube.cross_edges_home), recount(cube))
+
+    def test_interleaved_apply_undo(self):
+        rng = random.Random(1)
+        cube = Cube()
+        depth = 0
+        for _ in range(2000):
+            if depth and rng.random() < 0.4:
+                cube.undo()
+                depth -= 1
+            else:
+                cube.apply(rng.choice(MOVES))
+                depth += 1
+            self.assertEqual((cube.solved_pieces, cube.cross_edges_home), recount(cube))
+
+    def test_sync_after_direct_write(self):
+        source = Cube()
+        for mv in ["R", "U'", "F2", "D"]:
+            source.move(mv)
+        cube = Cube()
+        cube.cp, cube.co, cube.ep, cube.eo = source.cp[:], source.co[:], source.ep[:], source.eo[:]
+        cube.apply('L')
+        cube.sync()
+        self.assertEqual((cube.solved_pieces, cube.cross_edges_home), recount(cube))
+        with self.assertRaises(IndexError):
+            cube.undo()
+
+    def test_undo_empty(self):
+        with self.assertRaises(IndexError):
+            Cube().undo()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import contextlib
+import io
+import json
+import os
+import re
+import tempfile
+import unittest
+
+from cube.kociemba_cube import Cube
+
+try:
+    from view.plotly_cube import plot_cube, plot_cube_steps
+except ImportError:  # 未安装plotly
+    plot_cube = plot_cube_steps = None
+
+STAGES = {'extract', 'mesh', 'serialize'}
+
+
+def read_figure(path):
+    """从write_html写出的文件中解析 (html, data, layout, frames)。"""
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    decoder = json.JSONDecoder()
+    pos = re.search(r'Plotly\.newPlot\(\s*"[^"]+",\s*', html).end()
+    data, pos = decoder.raw_decode(html, pos)
+    pos = re.compile(r',\s*').match(html, pos).end()
+    layout, _ = decoder.raw_decode(html, pos)
+    frames = []
+    match = re.search(r"Plotly\.addFrames\('[^']+',\s*", html)
+    if match:
+        frames, _ = decoder.raw_decode(html, match.end())
+    return html, data, layout, frames
+
+
+def scrambled(moves):
+    cube = Cube()
+    for mv in moves.split():
+        cube.move(mv)
+    return cube
+
+
+class WorkdirTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self._tmp.name, name)
+
+    def quiet(self, fn, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args, **kwargs)
+
+
+@unittest.skipIf(plot_cube_steps is None, 'plotly未安装')
+class TestPlotCubeSteps(WorkdirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cubes = [Cube(), scrambled("R U F'"), scrambled("R U F' L2 D B")]
+        self.titles = ['Solved', 'Step 1', 'Step 2']
+
+    def test_frames_and_single_plotlyjs(self):
+        filename = self.path('steps.html')
+        self.quiet(plot_cube_steps, self.cubes, self.titles, filename=filename)
+        html, data, layout, frames = read_figure(filename)
+        self.assertEqual(len(re.findall(r'plotly\.js v\d', html)), 1)
+        self.assertEqual([f['name'] for f in frames], ['0', '1', '2'])
+        steps = layout['sliders'][0]['steps']
+        self.assertEqual([s['label'] for s in steps], self.titles)
+        self.assertEqual([s['args'][0] for s in steps], [['0'], ['1'], ['2']])
+
+    def test_frames_carry_only_colors(self):
+        filename = self.path('steps.html')
+        self.quiet(plot_cube_steps, self.cubes, self.titles, filename=filename)
+        _, data, _, frames = read_figure(filename)
+        mesh = data[0]
+        self.assertEqual(mesh['type'], 'mesh3d')
+        n_triangles = len(mesh['i'])
+        for frame in frames:
+            self.assertEqual(frame['traces'], [0])
+            self.assertEqual(len(frame['data']), 1)
+            frame_mesh = frame['data'][0]
+            self.assertEqual(set(frame_mesh) - {'type'}, {'facecolor'})
+            self.assertEqual(len(frame_mesh['facecolor']), n_triangles)
+        # 不同状态的颜色确实不同，第一帧与初始网格一致
+        self.assertEqual(frames[0]['data'][0]['facecolor'], mesh['facecolor'])
+        self.assertNotEqual(frames[0]['data'][0]['facecolor'], frames[2]['data'][0]['facecolor'])
+
+    def test_matches_single_plot(self):
+        single, steps = self.path('one.html'), self.path('steps.html')
+        self.quiet(plot_cube, self.cubes[2], filename=single)
+        self.quiet(plot_cube_steps, self.cubes, self.titles, filename=steps)
+        _, one_data, _, _ = read_figure(single)
+        _, step_data, _, frames = read_figure(steps)
+        for key in ('x', 'y', 'z', 'i', 'j', 'k'):
+            self.assertEqual(one_data[0][key], step_data[0][key])
+        self.assertEqual(one_data[0]['facecolor'], frames[2]['data'][0]['facecolor'])
+
+    def test_invalid_arguments(self):
+        filename = self.path('bad.html')
+        with self.assertRaises(ValueError):
+            plot_cube_steps([], filename=filename)
+        with self.assertRaises(ValueError):
+            plot_cube_steps(self.cubes, ['only one'], filename=filename)
+
+        class ShiftedCube(Cube):
+            def get_state(self):
+                state = super().get_state()
+                state[-1] = {'position': (9, 9, 9), 'colors': {}}
+                return state
+
+        with self.assertRaises(ValueError):
+            plot_cube_steps([Cube(), ShiftedCube()], filename=filename)
+        self.assertFalse(os.path.exists(filename))
+
+    def test_timings(self):
+        timings = {}
+        self.quiet(plot_cube_steps, self.cubes, filename=self.path('steps.html'), timings=timings)
+        self.assertEqual(set(timings), STAGES)
+        self.assertTrue(all(v >= 0 for v in timings.values()))
+
+
+@unittest.skipIf(plot_cube is None, 'plotly未安装')
+class TestPlotCube(WorkdirTestCase):
+    def test_timings_accumulate(self):
+        timings = {}
+        self.quiet(plot_cube, Cube(), filename=self.path('a.html'), timings=timings)
+        first = dict(timings)
+        self.quiet(plot_cube, Cube(), filename=self.path('b.html'), timings=timings)
+        self.assertEqual(set(timings), STAGES)
+        for stage in STAGES:
+            self.assertGreaterEqual(timings[stage], first[stage])
+
+    def test_no_frames(self):
+        filename = self.path('one.html')
+        self.quiet(plot_cube, Cube(), filename=filename)
+        html, data, _, frames = read_figure(filename)
+        self.assertEqual(len(re.findall(r'plotly\.js v\d', html)), 1)
+        self.assertEqual([t['type'] for t in data], ['mesh3d', 'scatter3d'])
+        self.assertEqual(frames, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
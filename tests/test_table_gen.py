@@ -0,0 +1,79 @@
+import unittest
+from collections import deque
+
+from tutorial.cfop_cross import CROSS_EDGES, CROSS_MOVE_SET, cross_goal_indices, get_cross_prune_table
+from utils.table_gen import build_table, corner_move_table, edge_move_table
+
+
+def plain_bfs(coord_tables, goal_indices):
+    radix = [len(t[0]) for t in coord_tables]
+    total = 1
+    for r in radix:
+        total *= r
+    table = bytearray([0xff]) * total
+    queue = deque()
+    for idx in goal_indices:
+        table[idx] = 0
+        queue.append(idx)
+    while queue:
+        idx = queue.popleft()
+        coords, rest = [], idx
+        for r in reversed(radix):
+            rest, c = divmod(rest, r)
+            coords.append(c)
+        coords.reverse()
+        for m in range(len(coord_tables[0])):
+            n = 0
+            for j, r in enumerate(radix):
+                n = n*r + coord_tables[j][m][coords[j]]
+            if table[n] == 0xff:
+                table[n] = table[idx] + 1
+                queue.append(n)
+    return table
+
+
+class TestBuildTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.corners = corner_move_table(CROSS_MOVE_SET)
+        cls.edges = edge_move_table(CROSS_MOVE_SET)
+
+    def build(self, coord_tables, goals, processes, **kwargs):
+        directions = []
+        table = build_table(coord_tables, goals, processes=processes,
+                            progress=lambda *args: directions.append(args[-1]), **kwargs)
+        return table, directions
+
+    def test_dense_table_runs_backward(self):
+        # 两个角块：576个索引中504个可达，尾部层反向扩展更省
+        tables, goals = [self.corners, self.corners], [3]
+        expected = plain_bfs(tables, goals)
+        for processes in (1, 2):
+            table, directions = self.build(tables, goals, processes)
+            self.assertEqual(table, expected)
+            self.assertIn('backward', directions)
+            self.assertIn('forward', directions)
+
+    def test_three_corners(self):
+        tables, goals = [self.corners] * 3, [0*576 + 3*24 + 6]
+        expected = plain_bfs(tables, goals)
+        for processes in (1, 2):
+            self.assertEqual(self.build(tables, goals, processes)[0], expected)
+        # 给出可达状态数时结果不变
+        self.assertEqual(self.build(tables, goals, 1, n_states=8*7*6*27)[0], expected)
+
+    def test_cross_table(self):
+        tables = [self.edges] * len(CROSS_EDGES)
+        expected = plain_bfs(tables, cross_goal_indices())
+        self.assertEqual(get_cross_prune_table(), expected)
+        self.assertEqual(self.build(tables, cross_goal_indices(), 2)[0], expected)
+
+    def test_max_depth_exceeded(self):
+        tables = [self.corners, self.corners]
+        with self.assertRaises(RuntimeError):
+            build_table(tables, [3], processes=1, max_depth=3)
+        self.assertEqual(build_table(tables, [3], processes=1, max_depth=4), plain_bfs(tables, [3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
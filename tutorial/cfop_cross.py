@@ -3,10 +3,11 @@ CFOP教程第一阶段：十字（Cross）
 本模块实现Cube的白色十字暴力解法与判定。
 """
 from cube.kociemba_cube import Cube
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
+import time
 
 # 白色十字棱块编号（DF, DR, DB, DL），Cube.edge_names索引
-CROSS_EDGES = [5, 4, 7, 6]  # DF, DR, DB, DL
+CROSS_EDGES = Cube.cross_edges
 CROSS_MOVES = ["F", "R", "B", "L", "D", "U"]
 
 def is_cross_solved(cube: Cube) -> bool:
@@ -23,27 +24,30 @@ def cfop_cross_solver(cube: Cube, max_depth=7) -> List[str]:
     MOVE_SET = [m for m in CROSS_MOVES] + [m+"'" for m in CROSS_MOVES] + [m+"2" for m in CROSS_MOVES]
     visited = set()
     queue = deque()
-    queue.append((cube, []))
-    visited.add((tuple(cube.ep), tuple(cube.eo)))
+    start = (tuple(cube.ep), tuple(cube.eo))
+    queue.append((start, []))
+    visited.add(start)
+    # 十字只看棱块：所有节点共用一个草稿魔方，apply/undo试探子节点
+    scratch = Cube()
     while queue:
-        cur_cube, moves = queue.popleft()
-        if is_cross_solved(cur_cube):
+        (ep, eo), moves = queue.popleft()
+        scratch.ep[:] = ep
+        scratch.eo[:] = eo
+        scratch.sync()
+        if is_cross_solved(scratch):
             return moves
         if len(moves) >= max_depth:
             continue
         for mv in MOVE_SET:
-            new_cube = Cube()
-            new_cube.cp = cur_cube.cp[:]
-            new_cube.co = cur_cube.co[:]
-            new_cube.ep = cur_cube.ep[:]
-            new_cube.eo = cur_cube.eo[:]
-            new_cube.move(mv)
-            state = (tuple(new_cube.ep), tuple(new_cube.eo))
+            scratch.apply(mv)
+            state = (tuple(scratch.ep), tuple(scratch.eo))
+            scratch.undo()
             if state not in visited:
                 visited.add(state)
-                queue.append((new_cube, moves + [mv]))
+                queue.append((state, moves + [mv]))
     return []  # 未找到
 
+
     def _get_kociemba_color_map(self):
         """
         返回魔方中心块颜色到kociemba标准字母的映射。
@@ -297,3 +301,123 @@ def cfop_cross_solver(cube: Cube, max_depth=7) -> List[str]:
                 all_done = False
             if all_done:
                 break
+
+
+# ---- 多解枚举 ----
+# 十字状态坐标：四个十字棱块各自的 (位置*2+朝向)，取值 0..23，合成 24**4 的整数索引
+CROSS_MOVE_SET = CROSS_MOVES + [m+"'" for m in CROSS_MOVES] + [m+"2" for m in CROSS_MOVES]
+# 同轴的两个面可交换，只保留一种先后顺序以去掉重复解
+_FACE_AXIS = {'U': 0, 'D': 0, 'F': 1, 'B': 1, 'L': 2, 'R': 2}
+_FACE_ORDER = {f: i for i, f in enumerate('UDFBLR')}
+
+_edge_move_table = None   # {move: [24个坐标的转移结果]}
+_cross_prune_table = None # bytearray，到十字完成的最少步数
+
+def _cross_index(cube: Cube) -> int:
+    idx = 0
+    for piece in CROSS_EDGES:
+        p = cube.ep.index(piece)
+        idx = idx*24 + p*2 + cube.eo[p]
+    return idx
+
+def _split_index(idx: int) -> List[int]:
+    coords = [0]*4
+    for k in range(3, -1, -1):
+        idx, coords[k] = divmod(idx, 24)
+    return coords
+
+def _join_index(coords: List[int]) -> int:
+    return ((coords[0]*24 + coords[1])*24 + coords[2])*24 + coords[3]
+
+def cross_goal_indices() -> List[int]:
+    """十字完成的状态索引：四个十字棱块占据D层四个位置且朝向为0（与is_cross_solved一致）。"""
+    from itertools import permutations
+    return [_join_index([p*2 for p in perm]) for perm in permutations(CROSS_EDGES)]
+
+def get_cross_prune_table() -> bytearray:
+    """返回十字剪枝表（首次调用时生成，之后复用）。"""
+    global _edge_move_table, _cross_prune_table
+    if _cross_prune_table is not None:
+        return _cross_prune_table
+    from utils.table_gen import build_table, edge_move_table
+    tables = edge_move_table(CROSS_MOVE_SET)
+    _edge_move_table = dict(zip(CROSS_MOVE_SET, tables))
+    # 表很小，进程池启动开销反而更大，单进程生成
+    _cross_prune_table = build_table([tables] * len(CROSS_EDGES), cross_goal_indices(), processes=1)
+    return _cross_prune_table
+
+def cross_distance(cube: Cube) -> int:
+    """十字最优步数（半周转动计1步）。"""
+    return get_cross_prune_table()[_cross_index(cube)]
+
+def iter_cross_solutions(cube: Cube, extra_depth: int = 1, max_depth: int = 8,
+                         move_costs: Optional[Dict[str, float]] = None,
+                         max_count: Optional[int] = None,
+                         time_limit: Optional[float] = None) -> Iterator[Tuple[List[str], float]]:
+    """惰性枚举十字解，按 (步数, 总权重) 从小到大产出 (moves, cost)。
+
+    参数：
+        cube: 起始状态，不会被修改。
+        extra_depth: 最多比最优解多几步（默认最优+1）。
+        max_depth: 步数上限。
+        move_costs: 转动权重（不能为负），如 {"B": 1.5, "B'": 1.5}；未列出的转动记1。
+        max_count: 最多产出的解数量，取到的即是排序最靠前的N个。
+        time_limit: 枚举时间上限（秒）。
+    同轴转动只保留一种顺序（如 U D 而非 D U），且解在最后一步之前不会经过已完成的十字。
+    """
+    # 参数校验与查表放在生成器外，调用时即报错
+    table = get_cross_prune_table()
+    move_costs = move_costs or {}
+    branches = [(mv, _edge_move_table[mv], move_costs.get(mv, 1)) for mv in CROSS_MOVE_SET]
+    min_cost = min(w for _, _, w in branches)
+    if min_cost < 0:
+        raise ValueError('move_costs不能为负')
+    start = _split_index(_cross_index(cube))
+    optimal = table[_join_index(start)]
+    if optimal > max_depth or (max_count is not None and max_count <= 0):
+        return iter(())
+    last_length = min(optimal + extra_depth, max_depth)
+    return _search_cross_solutions(table, branches, min_cost, start, optimal, last_length,
+                                   max_count, time_limit)
+
+def _search_cross_solutions(table, branches, min_cost, start, optimal, last_length,
+                            max_count, time_limit):
+    import heapq
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    if optimal == 0:
+        # 起点已完成十字：更长的解都会经过起点，只有空解
+        yield [], 0
+        return
+    emitted = 0
+
+    for length in range(optimal, last_length + 1):
+        # 固定步数内做最优优先搜索：剩余每步至少花min_cost，估价可采纳，出堆的完整解即按权重有序
+        # 堆项: (估价, -已走步数, 序号, 已花权重, 坐标, 上一面, 路径)
+        counter = 0
+        heap = [(length * min_cost, 0, counter, 0, start, None, ())]
+        while heap:
+            if deadline is not None and time.perf_counter() > deadline:
+                return
+            _, neg_depth, _, cost, coords, last_face, path = heapq.heappop(heap)
+            remaining = length + neg_depth
+            if remaining == 0:
+                yield list(path), cost
+                emitted += 1
+                if max_count is not None and emitted >= max_count:
+                    return
+                continue
+            for mv, mt, w in branches:
+                face = mv[0]
+                if face == last_face:
+                    continue
+                if (last_face is not None and _FACE_AXIS[face] == _FACE_AXIS[last_face]
+                        and _FACE_ORDER[face] < _FACE_ORDER[last_face]):
+                    continue
+                nc = [mt[coords[0]], mt[coords[1]], mt[coords[2]], mt[coords[3]]]
+                d = table[_join_index(nc)]
+                # d == 0 且还有剩余步数：十字提前完成，留给更短的解
+                if d > remaining - 1 or (d == 0 and remaining > 1):
+                    continue
+                counter += 1
+                heapq.heappush(heap, (cost + w + (remaining - 1) * min_cost, neg_depth - 1, counter,
+                                      cost + w, nc, face, path + (mv,)))
@@ -0,0 +1,227 @@
+"""
+距离表（剪枝表/模式数据库）生成引擎。
+状态由k个子坐标按混合进制合成一个整数索引，每个子坐标各自有一张转动表
+（如十字表：4个棱块各自的 位置*2+朝向）。BFS按层推进，每层切成若干区间分给进程池，
+所有进程读写同一块共享内存表（单进程时直接用bytearray）。
+"""
+from typing import Callable, Iterable, List, Optional
+import os
+import time
+
+from cube.kociemba_cube import Cube
+
+UNSEEN = 0xff
+
+_worker = {}  # 子进程内的共享表与转动表
+
+
+def edge_move_table(moves: List[str]) -> List[List[int]]:
+    """单个棱块坐标（位置*2+朝向，0..23）在各转动下的去向，由Cube.move推出。"""
+    return _piece_move_table(moves, 12, 2, 'ep', 'eo')
+
+
+def corner_move_table(moves: List[str]) -> List[List[int]]:
+    """单个角块坐标（位置*3+朝向，0..23）在各转动下的去向，由Cube.move推出。"""
+    return _piece_move_table(moves, 8, 3, 'cp', 'co')
+
+
+def _piece_move_table(moves, n, n_ori, perm_attr, ori_attr):
+    # 在已复原魔方上执行一次转动，读出每个位置的去向与朝向增量
+    table = []
+    for mv in moves:
+        c = Cube()
+        c.move(mv)
+        perm, ori = getattr(c, perm_attr), getattr(c, ori_attr)
+        dest = [0]*n
+        for i in range(n):
+            dest[perm[i]] = i
+        coords = []
+        for coord in range(n*n_ori):
+            p, o = divmod(coord, n_ori)
+            q = dest[p]
+            coords.append(q*n_ori + (o + ori[q]) % n_ori)
+        table.append(coords)
+    return table
+
+
+def print_progress(depth, new_states, visited, total, elapsed, direction):
+    rate = new_states / elapsed if elapsed > 0 else 0.0
+    print(f"[table] depth {depth:2d} {direction:8s} +{new_states} ({visited}/{total}) "
+          f"{elapsed*1000:.1f}ms {rate:,.0f} states/s")
+
+
+def build_table(coord_tables: List[List[List[int]]], goal_indices: Iterable[int],
+                processes: Optional[int] = None,
+                progress: Optional[Callable] = None,
+                max_depth: int = 254,
+                n_states: Optional[int] = None) -> bytearray:
+    """按层BFS生成距离表，返回bytearray（不可达索引为0xff）。
+
+    参数：
+        coord_tables: 每个子坐标一张转动表 [move][coord]，各表的转动顺序须一致；
+            转动集须对逆转动封闭（如同时含X与X'），反向扩展依赖这一点。
+        goal_indices: 距离为0的状态索引。
+        processes: 进程数，缺省为CPU核数；1则在当前进程内用bytearray完成，不需要共享内存。
+        progress: 每层结束回调 progress(depth, new_states, visited, total, elapsed, direction)。
+        max_depth: 最大层数（不超过254）；超过后仍有可扩展状态则抛RuntimeError。
+        n_states: 已知的可达状态数；给定时访问满即停止，并用于估算剩余状态。
+    每层估算两个方向的代价后择优：正向对前沿逐个求邻居；反向扫描全部未访问索引
+    （包括永远不可达的，如两块占同一位置），看其邻居是否在上一层。
+    """
+    if max_depth > UNSEEN - 1:
+        raise ValueError(f'max_depth不能超过{UNSEEN - 1}')
+    radix = [len(t[0]) for t in coord_tables]
+    total = 1
+    for r in radix:
+        total *= r
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        table = bytearray([UNSEEN]) * total
+        _worker.update(buf=table, tables=coord_tables, radix=radix)
+        try:
+            run = lambda fn, args: [fn(*a) for a in args]
+            _bfs(table, total, [(0, total)], run, len(coord_tables[0]), goal_indices, progress, max_depth, n_states)
+        finally:
+            _worker.clear()
+        return table
+
+    # 共享内存需Python 3.8+，只在多进程时才用到
+    from multiprocessing import Pool, shared_memory
+    shm = shared_memory.SharedMemory(create=True, size=total)
+    buf = shm.buf
+    pool = None
+    try:
+        buf[:total] = bytes([UNSEEN]) * total
+        # 区间数取进程数的4倍，平衡各区间前沿疏密不均
+        step = -(-total // (processes * 4))
+        chunks = [(lo, min(lo + step, total)) for lo in range(0, total, step)]
+        pool = Pool(processes, initializer=_init_worker,
+                    initargs=(shm.name, total, coord_tables, radix))
+        _bfs(buf, total, chunks, pool.starmap, len(coord_tables[0]), goal_indices, progress, max_depth, n_states)
+        return bytearray(buf[:total])
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        del buf
+        shm.close()
+        shm.unlink()
+
+
+def _bfs(buf, total, chunks, run, n_moves, goal_indices, progress, max_depth, n_states):
+    # 逐层推进；run(fn, [参数...]) 负责把各区间分发给进程池或就地执行
+    reachable = total if n_states is None else n_states
+    frontier = 0
+    for idx in goal_indices:
+        if buf[idx] == UNSEEN:
+            buf[idx] = 0
+            frontier += 1
+    visited = frontier
+
+    depth = 0
+    prev_frontier = 0
+    while frontier and visited < reachable:
+        if depth == max_depth:
+            if any(run(_has_unseen_neighbor, [(lo, hi, depth) for lo, hi in chunks])):
+                raise RuntimeError(f'已到max_depth={max_depth}，仍有状态未访问，表不完整')
+            break
+        depth += 1
+        start = time.perf_counter()
+        # 按上一层的增长率外推本层新增数，不超过剩余可达状态
+        growth = frontier / prev_frontier if prev_frontier else n_moves
+        expected = min(frontier * growth, reachable - visited)
+        # 正向：每个前沿状态求n_moves个邻居
+        # 反向：未命中的未访问索引要查满n_moves个邻居，命中的平均约一半
+        forward_cost = frontier * n_moves
+        backward_cost = (total - visited - expected) * n_moves + expected * n_moves / 2
+        if forward_cost <= backward_cost:
+            direction = 'forward'
+            run(_expand_forward, [(lo, hi, depth) for lo, hi in chunks])
+            # 并发写同一格会重复计数，层结束后再数一遍
+            new_states = sum(run(_count_depth, [(lo, hi, depth) for lo, hi in chunks]))
+        else:
+            direction = 'backward'
+            new_states = sum(run(_expand_backward, [(lo, hi, depth) for lo, hi in chunks]))
+        visited += new_states
+        prev_frontier, frontier = frontier, new_states
+        if progress is not None and new_states:
+            progress(depth, new_states, visited, reachable, time.perf_counter() - start, direction)
+    if visited > reachable:
+        raise ValueError(f'访问到{visited}个状态，超过n_states={n_states}')
+
+
+def _init_worker(name, total, coord_tables, radix):
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=name)
+    _worker.update(shm=shm, buf=shm.buf[:total], tables=coord_tables, radix=radix)
+
+
+def _neighbors(idx):
+    # 拆分混合进制索引，逐个转动求邻居索引
+    tables, radix = _worker['tables'], _worker['radix']
+    coords = []
+    for r in reversed(radix):
+        idx, c = divmod(idx, r)
+        coords.append(c)
+    coords.reverse()
+    k = len(radix)
+    for m in range(len(tables[0])):
+        n = 0
+        for j in range(k):
+            n = n*radix[j] + tables[j][m][coords[j]]
+        yield n
+
+
+def _expand_forward(lo, hi, depth):
+    buf = _worker['buf']
+    prev = depth - 1
+    chunk = bytes(buf[lo:hi])
+    pos = chunk.find(prev)
+    while pos != -1:
+        for n in _neighbors(lo + pos):
+            if buf[n] == UNSEEN:
+                buf[n] = depth
+        pos = chunk.find(prev, pos + 1)
+
+
+def _expand_backward(lo, hi, depth):
+    buf = _worker['buf']
+    prev = depth - 1
+    chunk = bytes(buf[lo:hi])
+    found = 0
+    pos = chunk.find(UNSEEN)
+    while pos != -1:
+        idx = lo + pos
+        for n in _neighbors(idx):
+            if buf[n] == prev:
+                buf[idx] = depth
+                found += 1
+                break
+        pos = chunk.find(UNSEEN, pos + 1)
+    return found
+
+
+def _has_unseen_neighbor(lo, hi, depth):
+    buf = _worker['buf']
+    chunk = bytes(buf[lo:hi])
+    pos = chunk.find(depth)
+    while pos != -1:
+        for n in _neighbors(lo + pos):
+            if buf[n] == UNSEEN:
+                return True
+        pos = chunk.find(depth, pos + 1)
+    return False
+
+
+def _count_depth(lo, hi, depth):
+    return bytes(_worker['buf'][lo:hi]).count(depth)
+
+
+if __name__ == '__main__':
+    import sys
+    from tutorial.cfop_cross import CROSS_EDGES, CROSS_MOVE_SET, cross_goal_indices
+    n_proc = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    t0 = time.perf_counter()
+    table = build_table([edge_move_table(CROSS_MOVE_SET)] * len(CROSS_EDGES), cross_goal_indices(),
+                        processes=n_proc, progress=print_progress)
+    print(f"cross table: {len(table)} bytes, {time.perf_counter()-t0:.2f}s")
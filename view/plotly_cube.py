@@ -1,3 +1,4 @@
+import time
 import plotly.graph_objects as go
 from cube.kociemba_cube import Cube
 
@@ -39,107 +40,127 @@ FACE_TO_TRIANGLES = {
     'L': [10, 11]
 }
 
-def plot_cube(cube, title: str = "Rubik's Cube", filename: str = 'cube.html'):
-    """生成魔方当前状态的交互式3D可视化。
+# 单个小块的12条边（相对小块原点）
+CUBELET_EDGES = [
+    ([0,1],[0,0],[0,0]), ([1,1],[0,1],[0,0]), ([1,0],[1,1],[0,0]), ([0,0],[0,1],[0,0]), # 底面
+    ([0,1],[0,0],[1,1]), ([1,1],[0,1],[1,1]), ([1,0],[1,1],[1,1]), ([0,0],[0,1],[1,1]), # 顶面
+    ([0,0],[0,0],[0,1]), ([1,1],[0,0],[0,1]), ([1,1],[1,1],[0,1]), ([0,0],[1,1],[0,1])  # 垂直边
+]
 
-    参数：
-        cube: 要可视化的Cube对象。
-        title: 图表标题。
-        filename: 保存HTML文件名。
-    """
+
+class _StageTimer:
+    """把各阶段耗时（秒）累加到调用方传入的timings字典中。"""
+    def __init__(self, timings, stage):
+        self.timings = timings
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.timings is not None:
+            self.timings[self.stage] = self.timings.get(self.stage, 0.0) + time.perf_counter() - self.start
+        return False
+
+
+def _extract_state(cube):
+    """取魔方状态并按位置排序，保证不同状态的网格拓扑一致。"""
+    return sorted(cube.get_state(), key=lambda d: tuple(d['position']))
+
+
+def _color_of(colors, face_name):
+    # 兼容Color枚举、str、无贴纸，优先用单字母大写缩写
+    v = colors.get(face_name, 'NONE')
+    if hasattr(v, 'name'):
+        color_key = v.name[0].upper()
+    elif isinstance(v, str):
+        color_key = v[0].upper() if v else 'NONE'
+    else:
+        color_key = str(v)[0].upper() if v else 'NONE'
+    return COLOR_MAP.get(color_key, COLOR_MAP['NONE'])
+
+
+def _outer_faces(pos, size):
+    # 该位置小块朝外的面（只渲染魔方外表面），顺序同FACE_TO_TRIANGLES
+    for face_name, triangle_indices in FACE_TO_TRIANGLES.items():
+        if face_name == 'U' and pos[1] == size - 1:
+            yield face_name, triangle_indices
+        elif face_name == 'D' and pos[1] == 0:
+            yield face_name, triangle_indices
+        elif face_name == 'F' and pos[2] == size - 1:
+            yield face_name, triangle_indices
+        elif face_name == 'B' and pos[2] == 0:
+            yield face_name, triangle_indices
+        elif face_name == 'R' and pos[0] == size - 1:
+            yield face_name, triangle_indices
+        elif face_name == 'L' and pos[0] == 0:
+            yield face_name, triangle_indices
+
+
+def _build_mesh(cube_state, size):
+    """构建网格拓扑 (x, y, z, i, j, k)，只取决于各小块位置。"""
     all_x, all_y, all_z = [], [], []  # 所有顶点坐标
     all_i, all_j, all_k = [], [], []  # 所有三角面索引
-    all_face_colors = []              # 所有三角面颜色
-    
-    cube_state = cube.get_state()     # 获取魔方所有小块状态
-    
+
     offset = 0
-    size = cube.size
+    center_offset = (size - 1) / 2.0  # 居中显示
     for cubelet_data in cube_state:
         pos = cubelet_data['position']
-        colors = cubelet_data['colors']
-
-        center_offset = (size - 1) / 2.0  # 居中显示
 
         for vx, vy, vz in VERTICES:
             all_x.append(vx + (pos[0] - center_offset) - 0.5)
             all_y.append(vy + (pos[2] - center_offset) - 0.5)
             all_z.append(vz + (pos[1] - center_offset) - 0.5)
 
-        # 只渲染魔方外表面
-        for face_name, triangle_indices in FACE_TO_TRIANGLES.items():
-            # 判断该面是否为外表面
-            is_outer = False
-            if face_name == 'U' and pos[1] == size - 1:
-                is_outer = True
-            elif face_name == 'D' and pos[1] == 0:
-                is_outer = True
-            elif face_name == 'F' and pos[2] == size - 1:
-                is_outer = True
-            elif face_name == 'B' and pos[2] == 0:
-                is_outer = True
-            elif face_name == 'R' and pos[0] == size - 1:
-                is_outer = True
-            elif face_name == 'L' and pos[0] == 0:
-                is_outer = True
-            if is_outer:
-                # 兼容Color枚举、str、无贴纸，优先用单字母大写缩写
-                v = colors.get(face_name, 'NONE')
-                if hasattr(v, 'name'):
-                    color_key = v.name[0].upper()
-                elif isinstance(v, str):
-                    color_key = v[0].upper() if v else 'NONE'
-                else:
-                    color_key = str(v)[0].upper() if v else 'NONE'
-                color = COLOR_MAP.get(color_key, COLOR_MAP['NONE'])
-                for tri_idx in triangle_indices:
-                    i, j, k = FACES[tri_idx]
-                    all_i.append(i + offset)
-                    all_j.append(j + offset)
-                    all_k.append(k + offset)
-                    all_face_colors.append(color)
+        for _, triangle_indices in _outer_faces(pos, size):
+            for tri_idx in triangle_indices:
+                i, j, k = FACES[tri_idx]
+                all_i.append(i + offset)
+                all_j.append(j + offset)
+                all_k.append(k + offset)
         offset += len(VERTICES)
 
-    # 创建Mesh3d三维网格对象
-    mesh = go.Mesh3d(
-        x=all_x,
-        y=all_y,
-        z=all_z,
-        i=all_i,
-        j=all_j,
-        k=all_k,
-        facecolor=all_face_colors,
-        flatshading=True,
-        hoverinfo='none'
-    )
+    return all_x, all_y, all_z, all_i, all_j, all_k
+
 
-    # 为每个小块添加边框线条
-    edge_traces = []
+def _face_colors(cube_state, size):
+    """按_build_mesh的三角面顺序给出每个三角面的颜色。"""
+    all_face_colors = []
+    for cubelet_data in cube_state:
+        colors = cubelet_data['colors']
+        for face_name, triangle_indices in _outer_faces(cubelet_data['position'], size):
+            color = _color_of(colors, face_name)
+            all_face_colors.extend([color] * len(triangle_indices))
+    return all_face_colors
+
+
+def _build_edge_lines(cube_state, size):
+    """所有小块的边框坐标，合并为一条折线（用None断开），减少trace数量。"""
+    center_offset = (size - 1) / 2.0
+    xs, ys, zs = [], [], []
     for cubelet_data in cube_state:
         pos = cubelet_data['position']
-        center_offset = (cube.size - 1) / 2.0
-        cx, cy, cz = pos[0] - center_offset, pos[1] - center_offset, pos[2] - center_offset
-
-        # 单个小块的12条边
-        edges = [
-            ([0,1],[0,0],[0,0]), ([1,1],[0,1],[0,0]), ([1,0],[1,1],[0,0]), ([0,0],[0,1],[0,0]), # 底面
-            ([0,1],[0,0],[1,1]), ([1,1],[0,1],[1,1]), ([1,0],[1,1],[1,1]), ([0,0],[0,1],[1,1]), # 顶面
-            ([0,0],[0,0],[0,1]), ([1,1],[0,0],[0,1]), ([1,1],[1,1],[0,1]), ([0,0],[1,1],[0,1])  # 垂直边
-        ]
+        for edge_x, edge_y, edge_z in CUBELET_EDGES:
+            xs += [v + (pos[0] - center_offset) - 0.5 for v in edge_x] + [None]
+            ys += [v + (pos[2] - center_offset) - 0.5 for v in edge_y] + [None] # z轴映射到Plotly的y
+            zs += [v + (pos[1] - center_offset) - 0.5 for v in edge_z] + [None] # y轴映射到Plotly的z
+    return xs, ys, zs
 
-        for edge_x, edge_y, edge_z in edges:
-            edge_traces.append(go.Scatter3d(
-                x=[v + (pos[0] - center_offset) - 0.5 for v in edge_x],
-                y=[v + (pos[2] - center_offset) - 0.5 for v in edge_y], # z轴映射到Plotly的y
-                z=[v + (pos[1] - center_offset) - 0.5 for v in edge_z], # y轴映射到Plotly的z
-                mode='lines',
-                line=dict(color='black', width=5),
-                hoverinfo='none',
-                showlegend=False
-            ))
-
-    # 创建布局
-    layout = go.Layout(
+
+def _edge_trace(edge_lines):
+    xs, ys, zs = edge_lines
+    return go.Scatter3d(
+        x=xs, y=ys, z=zs,
+        mode='lines',
+        line=dict(color='black', width=5),
+        hoverinfo='none',
+        showlegend=False
+    )
+
+
+def _build_layout(title):
+    return go.Layout(
         title=title,
         scene=dict(
             xaxis=dict(visible=False),
@@ -150,11 +171,109 @@ def plot_cube(cube, title: str = "Rubik's Cube", filename: str = 'cube.html'):
         margin=dict(l=0, r=0, b=0, t=40)
     )
 
+
+def _mesh_trace(topology, face_colors):
+    x, y, z, i, j, k = topology
+    return go.Mesh3d(
+        x=x, y=y, z=z,
+        i=i, j=j, k=k,
+        facecolor=face_colors,
+        flatshading=True,
+        hoverinfo='none'
+    )
+
+
+def plot_cube(cube, title: str = "Rubik's Cube", filename: str = 'cube.html', timings: dict = None):
+    """生成魔方当前状态的交互式3D可视化。
+
+    参数：
+        cube: 要可视化的Cube对象。
+        title: 图表标题。
+        filename: 保存HTML文件名。
+        timings: 可选字典，累加 extract/mesh/serialize 各阶段耗时（秒）；
+            mesh只含几何与颜色计算，plotly对象的构建计入serialize。
+    """
+    with _StageTimer(timings, 'extract'):
+        cube_state = _extract_state(cube)  # 获取魔方所有小块状态
+
+    with _StageTimer(timings, 'mesh'):
+        topology = _build_mesh(cube_state, cube.size)
+        face_colors = _face_colors(cube_state, cube.size)
+        edge_lines = _build_edge_lines(cube_state, cube.size)
+
     # 创建图形并保存为HTML
-    fig = go.Figure(data=[mesh] + edge_traces, layout=layout)
-    fig.write_html(filename)
+    with _StageTimer(timings, 'serialize'):
+        mesh = _mesh_trace(topology, face_colors)
+        fig = go.Figure(data=[mesh, _edge_trace(edge_lines)], layout=_build_layout(title))
+        fig.write_html(filename)
     print(f"已保存交互式魔方到 {filename}")
 
+
+def plot_cube_steps(cubes, titles=None, title: str = "Rubik's Cube", filename: str = 'cube_steps.html',
+                    include_plotlyjs=True, timings: dict = None):
+    """把多个魔方状态写入同一个HTML，用滑块/播放按钮切换。
+
+    所有状态共享一份网格拓扑与边框，每帧只携带三角面颜色；plotly.js只内嵌一次。
+
+    参数：
+        cubes: Cube对象序列（如教学的每一步快照），阶数须一致。
+        titles: 每帧的标题，缺省为 "Step n"。
+        title: 图表总标题。
+        filename: 保存HTML文件名。
+        include_plotlyjs: 透传给 write_html，可设为 'cdn' 进一步减小文件。
+        timings: 可选字典，累加 extract/mesh/serialize 各阶段耗时（秒）；
+            mesh只含几何与颜色计算，plotly对象的构建计入serialize。
+    """
+    cubes = list(cubes)
+    if not cubes:
+        raise ValueError('cubes不能为空')
+    if titles is None:
+        titles = [f'Step {n}' for n in range(len(cubes))]
+    if len(titles) != len(cubes):
+        raise ValueError('titles与cubes数量不一致')
+    size = cubes[0].size
+
+    with _StageTimer(timings, 'extract'):
+        states = [_extract_state(c) for c in cubes]
+
+    with _StageTimer(timings, 'mesh'):
+        # 拓扑只取决于位置，由第一个状态构建一次，其余帧只算颜色
+        positions = [d['position'] for d in states[0]]
+        for cube_state in states[1:]:
+            if [d['position'] for d in cube_state] != positions:
+                raise ValueError('各状态的小块位置不一致，无法共享网格拓扑')
+        topology = _build_mesh(states[0], size)
+        frame_colors = [_face_colors(cube_state, size) for cube_state in states]
+        edge_lines = _build_edge_lines(states[0], size)
+
+    with _StageTimer(timings, 'serialize'):
+        mesh = _mesh_trace(topology, frame_colors[0])
+        # 帧只更新第0条trace（网格）的颜色
+        frames = [
+            go.Frame(name=str(n), data=[go.Mesh3d(facecolor=colors)], traces=[0],
+                     layout=go.Layout(title=f'{title} - {titles[n]}'))
+            for n, colors in enumerate(frame_colors)
+        ]
+        anim_args = dict(mode='immediate', frame=dict(duration=0, redraw=True), transition=dict(duration=0))
+        layout = _build_layout(f'{title} - {titles[0]}')
+        layout.update(
+            sliders=[dict(
+                active=0,
+                currentvalue=dict(visible=False),
+                steps=[dict(label=titles[n], method='animate', args=[[str(n)], anim_args])
+                       for n in range(len(frames))]
+            )],
+            updatemenus=[dict(
+                type='buttons',
+                showactive=False,
+                buttons=[dict(label='Play', method='animate',
+                              args=[None, dict(anim_args, frame=dict(duration=800, redraw=True), fromcurrent=True)])]
+            )]
+        )
+        fig = go.Figure(data=[mesh, _edge_trace(edge_lines)], layout=layout, frames=frames)
+        fig.write_html(filename, include_plotlyjs=include_plotlyjs, auto_play=False)
+    print(f"已保存{len(frames)}步交互式魔方到 {filename}")
+
 if __name__ == '__main__':
     # 示例用法：
     my_cube = Cube()